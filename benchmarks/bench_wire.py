@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark wire format encode/decode time and payload size for intercepted request lists
+
+Usage: python benchmarks/bench_wire.py [--repeat N]
+"""
+
+import argparse
+import json
+import time
+
+from flipper_rpi import wire
+from flipper_rpi.utils import print_table
+
+
+def make_requests(count: int) -> dict:
+    """Build an /api/requests-shaped payload with count entries"""
+    methods = ["GET", "POST", "PUT", "DELETE"]
+    return {
+        "status": "success",
+        "requests": [
+            {
+                "id": f"req-{i:06d}",
+                "method": methods[i % len(methods)],
+                "url": f"http://example{i % 50}.com/api/v1/items/{i}?page={i % 7}",
+                "status": 200 if i % 10 else 404,
+                "size": 512 + (i * 37) % 8192,
+                "timestamp": 1700000000.0 + i * 0.25,
+                "headers": {"Host": f"example{i % 50}.com", "User-Agent": "curl/8.0"},
+            }
+            for i in range(count)
+        ],
+    }
+
+
+def timed(func, repeat: int) -> float:
+    """Best wall time of func over repeat runs, in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def bench(data: dict, repeat: int) -> list:
+    """Encode/decode timings and sizes for every available format"""
+    formats = [
+        ("json (indent=2)",
+         lambda d: json.dumps(d, indent=2, default=str).encode("utf-8"), json.loads),
+        ("json (compact)", lambda d: wire.dumps_json(d), wire.loads_json),
+    ]
+    if wire.msgpack is not None:
+        formats.append((
+            "msgpack",
+            lambda d: wire.encode(d, wire.MSGPACK_MIMETYPE),
+            lambda b: wire.decode(b, wire.MSGPACK_MIMETYPE),
+        ))
+
+    rows = []
+    for name, encode, decode in formats:
+        payload = encode(data)
+        rows.append({
+            "format": name,
+            "encode_ms": f"{timed(lambda: encode(data), repeat):.2f}",
+            "decode_ms": f"{timed(lambda: decode(payload), repeat):.2f}",
+            "size_kb": f"{len(payload) / 1024:.1f}",
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is kept)")
+    args = parser.parse_args()
+
+    print(f"orjson: {'yes' if wire.orjson else 'no'}, msgpack: {'yes' if wire.msgpack else 'no'}")
+    for count in (1_000, 10_000):
+        print(f"\n{count} requests:")
+        print_table(bench(make_requests(count), args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Columnar traffic analytics over captured requests
+"""
+
+import logging
+import math
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+try:
+    import numpy as np
+except ImportError:  # optional: pip install flipper-rpi-control[analytics]
+    np = None
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 90, 95, 99)
+
+# Largest timeline span, in buckets, that analyze() accepts
+MAX_TIMELINE_BUCKETS = 100000
+
+# Prefix of capture versions derived locally rather than reported by FlipperHTTP
+DERIVED_VERSION_PREFIX = "~"
+# Seconds a result keyed by a derived version stays cached, since older
+# entries (e.g. pending ones) can change without the newest entry changing
+DERIVED_VERSION_TTL = 30
+
+
+def _finite(value: float) -> float:
+    """Map inf/-inf to NaN so they count as unknown"""
+    return value if math.isfinite(value) else float("nan")
+
+
+def _to_timestamp(value: Any) -> float:
+    """Convert an epoch number or ISO-8601 string to epoch seconds (NaN if unknown)"""
+    if isinstance(value, (int, float)):
+        return _finite(float(value))
+    if isinstance(value, str):
+        try:
+            return _finite(float(value))
+        except ValueError:
+            pass
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            pass
+    return float("nan")
+
+
+def _to_number(value: Any) -> float:
+    """Convert a size/status field to float (NaN if missing, not numeric or infinite)"""
+    try:
+        return _finite(float(value))
+    except (TypeError, ValueError, OverflowError):
+        return float("nan")
+
+
+def capture_version(result: Dict[str, Any]) -> str:
+    """Identify a capture so analytics can be cached until it changes
+
+    Only the newest request is needed, so a limit=1 fetch is enough. Without a
+    FlipperHTTP capture_version, the newest request's ID, status and size are
+    used and the version is marked as derived (see DERIVED_VERSION_TTL).
+    """
+    if result.get("capture_version") is not None:
+        return str(result["capture_version"])
+    requests_list = result.get("requests", [])
+    if not requests_list:
+        return DERIVED_VERSION_PREFIX
+    newest = requests_list[-1]
+    return f"{DERIVED_VERSION_PREFIX}{newest.get('id', '')}:{newest.get('status')}:{newest.get('size')}"
+
+
+class RequestColumns:
+    """Captured request metadata stored as column arrays"""
+
+    def __init__(self, requests_list: List[Dict[str, Any]]):
+        if np is None:
+            raise RuntimeError("numpy is required for analytics: pip install flipper-rpi-control[analytics]")
+
+        count = len(requests_list)
+        hosts = [""] * count
+        methods = [""] * count
+        statuses = np.empty(count, dtype=np.float64)
+        sizes = np.empty(count, dtype=np.float64)
+        timestamps = np.empty(count, dtype=np.float64)
+
+        for i, req in enumerate(requests_list):
+            hosts[i] = urlsplit(str(req.get("url", ""))).hostname or str(req.get("host") or "unknown")
+            methods[i] = str(req.get("method", "UNKNOWN")).upper()
+            statuses[i] = _to_number(req.get("status"))
+            sizes[i] = _to_number(req.get("size"))
+            timestamps[i] = _to_timestamp(req.get("timestamp"))
+
+        self.hosts = np.array(hosts, dtype=object)
+        self.methods = np.array(methods, dtype=object)
+        self.statuses = statuses
+        self.sizes = sizes
+        self.timestamps = timestamps
+
+    def __len__(self) -> int:
+        return len(self.hosts)
+
+
+def _group_counts(column, top: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Count occurrences of each value in a column, most frequent first"""
+    if len(column) == 0:
+        return []
+    values, counts = np.unique(column, return_counts=True)
+    order = np.argsort(-counts, kind="stable")
+    if top is not None:
+        order = order[:top]
+    return [{"value": values[i], "count": int(counts[i])} for i in order]
+
+
+def _size_stats(sizes) -> Dict[str, Any]:
+    """Summary statistics and percentiles for response sizes"""
+    known = sizes[~np.isnan(sizes)]
+    if known.size == 0:
+        return {"count": 0}
+    stats = {
+        "count": int(known.size),
+        "total": float(known.sum()),
+        "mean": float(known.mean()),
+        "min": float(known.min()),
+        "max": float(known.max()),
+    }
+    for pct, value in zip(PERCENTILES, np.percentile(known, PERCENTILES)):
+        stats[f"p{pct}"] = float(value)
+    return stats
+
+
+def _timeline(timestamps, bucket_seconds: int) -> List[Dict[str, Any]]:
+    """Request counts per non-empty time bucket"""
+    known = timestamps[~np.isnan(timestamps)]
+    if known.size == 0:
+        return []
+    start = np.floor(known.min() / bucket_seconds) * bucket_seconds
+    span = (known.max() - start) // bucket_seconds + 1
+    if span > MAX_TIMELINE_BUCKETS:
+        raise ValueError(
+            f"Timeline spans {int(span)} buckets of {bucket_seconds}s (max {MAX_TIMELINE_BUCKETS}); "
+            "use a larger bucket"
+        )
+    buckets, counts = np.unique(((known - start) // bucket_seconds).astype(np.int64), return_counts=True)
+    return [
+        {"start": float(start + bucket * bucket_seconds), "count": int(count)}
+        for bucket, count in zip(buckets, counts)
+    ]
+
+
+def analyze(requests_list: List[Dict[str, Any]], bucket_seconds: int = 60, top: int = 10) -> Dict[str, Any]:
+    """Compute host, status, method, size and timeline analytics for a capture
+
+    Raises ValueError if the timeline would exceed MAX_TIMELINE_BUCKETS.
+    """
+    columns = RequestColumns(requests_list)
+
+    statuses = columns.statuses
+    known_statuses = statuses[~np.isnan(statuses)].astype(np.int64)
+    status_codes = _group_counts(known_statuses)
+    for entry in status_codes:
+        entry["value"] = int(entry["value"])
+    pending = int(np.isnan(statuses).sum())
+    if pending:
+        status_codes.append({"value": "pending", "count": pending})
+
+    return {
+        "total_requests": len(columns),
+        "top_hosts": _group_counts(columns.hosts, top=top),
+        "methods": _group_counts(columns.methods),
+        "status_codes": status_codes,
+        "status_classes": [
+            {"value": f"{int(entry['value'])}xx", "count": entry["count"]}
+            for entry in _group_counts(known_statuses // 100)
+        ],
+        "sizes": _size_stats(columns.sizes),
+        "bucket_seconds": bucket_seconds,
+        "timeline": _timeline(columns.timestamps, bucket_seconds),
+    }
+
+
+class AnalyticsCache:
+    """Small LRU cache of analytics results keyed by capture version and query
+
+    Results for derived capture versions expire after derived_ttl seconds.
+    """
+
+    def __init__(self, maxsize: int = 16, derived_ttl: float = DERIVED_VERSION_TTL):
+        self.maxsize = maxsize
+        self.derived_ttl = derived_ttl
+        self._results = OrderedDict()
+
+    def get(self, version: str, fetch: Callable[[], List[Dict[str, Any]]],
+            bucket_seconds: int = 60, top: int = 10, limit: int = 100000) -> Dict[str, Any]:
+        """Return cached analytics for a capture version, calling fetch() only on a miss"""
+        key = (version, limit, bucket_seconds, top)
+        if key in self._results:
+            analytics, computed = self._results[key]
+            if not version.startswith(DERIVED_VERSION_PREFIX) or time.time() - computed < self.derived_ttl:
+                self._results.move_to_end(key)
+                return analytics
+            del self._results[key]
+
+        analytics = analyze(fetch(), bucket_seconds=bucket_seconds, top=top)
+        analytics["capture_version"] = version
+        self._results[key] = (analytics, time.time())
+        if len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+        logger.debug(f"Analytics computed for capture {version}")
+        return analytics
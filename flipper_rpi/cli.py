@@ -4,12 +4,18 @@ CLI interface for Flipper RPi Control
 
 import click
 import logging
+import os
+import sys
+from datetime import datetime
 from .config import Config
-from .core import FlipperHTTPClient
+from .core import FlipperHTTPClient, ProxyPool
+from .analytics import analyze as analyze_requests
+from . import output
+from . import state as shared
 from .utils import (
     setup_logging, print_table, format_json, get_system_stats,
     success_message, error_message, info_message, warning_message,
-    validate_port
+    validate_port, parse_ports
 )
 
 
@@ -53,14 +59,25 @@ def connect(ctx):
 
 
 @cli.command()
-@click.option('--port', type=int, default=8888, help='Proxy port (default: 8888)')
+@click.option('--port', type=int, default=None, help='Proxy port (default: 8888)')
+@click.option('--ports', default=None, help='Comma-separated proxy pool ports, e.g. 8888,8889,9999')
 @click.pass_context
-def start_proxy(ctx, port):
+def start_proxy(ctx, port, ports):
     """Start the HTTP proxy"""
     client = ctx.obj['client']
     config = ctx.obj['config']
     logger = ctx.obj['logger']
     
+    if ports is not None:
+        if port is not None:
+            click.echo(error_message("Use either --port or --ports, not both"))
+            return
+        _start_proxy_pool(ctx, ports)
+        return
+    
+    if port is None:
+        port = 8888
+    
     # Validate port
     if not validate_port(port):
         click.echo(error_message(f"Port {port} is not available or invalid"))
@@ -69,6 +86,7 @@ def start_proxy(ctx, port):
     click.echo(f"Starting proxy on port {port}...")
     
     result = client.start_proxy(port=port)
+    _invalidate_shared(config, *shared.PROXY_KEYS)
     
     if result.get("status") == "success":
         config.update(proxy_port=port)
@@ -79,16 +97,88 @@ def start_proxy(ctx, port):
         logger.error(f"Proxy start failed: {result}")
 
 
+def _start_proxy_pool(ctx, ports):
+    """Start a proxy listener on each port of a comma-separated list"""
+    client = ctx.obj['client']
+    config = ctx.obj['config']
+    logger = ctx.obj['logger']
+    
+    try:
+        port_list = parse_ports(ports)
+    except ValueError as e:
+        click.echo(error_message(str(e)))
+        return
+    
+    invalid = [port for port in port_list if not validate_port(port)]
+    if invalid:
+        click.echo(error_message(f"Ports not available or invalid: {', '.join(map(str, invalid))}"))
+        return
+    
+    click.echo(f"Starting proxy pool on ports {', '.join(map(str, port_list))}...")
+    
+    pool = ProxyPool(client, port_list)
+    results = pool.start()
+    _invalidate_shared(config, *shared.PROXY_KEYS)
+    started = [port for port, result in results.items() if result.get("status") == "success"]
+    failed = [port for port in results if port not in started]
+    
+    for port, result in results.items():
+        if port in started:
+            click.echo(success_message(f"Proxy started on port {port}"))
+        else:
+            click.echo(error_message(f"Failed to start proxy on port {port}: {result.get('message')}"))
+            logger.error(f"Proxy start failed on port {port}: {result}")
+    
+    # Keep every requested port in the pool so a transient failure can be retried,
+    # stopped with --all and still shows up in status
+    config.update(proxy_ports=pool.ports)
+    if started:
+        config.update(proxy_port=started[0])
+        click.echo(info_message(f"Configure your tools to use: {', '.join(f'localhost:{p}' for p in started)}"))
+    if failed:
+        click.echo(warning_message(
+            f"{len(failed)} of {len(results)} ports failed to start: {', '.join(map(str, failed))}"
+        ))
+
+
 @cli.command()
+@click.option('--ports', default=None, help='Comma-separated proxy pool ports to stop')
+@click.option('--all', 'stop_all', is_flag=True, help='Stop every port in the configured proxy pool')
 @click.pass_context
-def stop_proxy(ctx):
+def stop_proxy(ctx, ports, stop_all):
     """Stop the HTTP proxy"""
     client = ctx.obj['client']
+    config = ctx.obj['config']
     logger = ctx.obj['logger']
     
+    if ports is not None or stop_all:
+        try:
+            port_list = parse_ports(ports) if ports is not None else config.proxy_ports
+        except ValueError as e:
+            click.echo(error_message(str(e)))
+            return
+        
+        if not port_list:
+            click.echo(warning_message("No proxy pool configured; use 'start-proxy --ports' first"))
+            return
+        
+        click.echo(f"Stopping proxy pool on ports {', '.join(map(str, port_list))}...")
+        
+        results = ProxyPool(client, port_list).stop()
+        _invalidate_shared(config, *shared.PROXY_KEYS)
+        
+        for port, result in results.items():
+            if result.get("status") == "success":
+                click.echo(success_message(f"Proxy stopped on port {port}"))
+            else:
+                click.echo(error_message(f"Failed to stop proxy on port {port}: {result.get('message')}"))
+                logger.error(f"Proxy stop failed on port {port}: {result}")
+        return
+    
     click.echo("Stopping proxy...")
     
     result = client.stop_proxy()
+    _invalidate_shared(config, *shared.PROXY_KEYS)
     
     if result.get("status") == "success":
         click.echo(success_message("Proxy stopped"))
@@ -96,56 +186,239 @@ def stop_proxy(ctx):
         click.echo(error_message(f"Failed to stop proxy: {result.get('message')}"))
 
 
+def _open_shared_state(config):
+    """Shared state published by a running web UI, or None"""
+    path = shared.default_state_path(config)
+    if not (config.shared_state and os.path.exists(path)):
+        return None
+    try:
+        return shared.SharedState(path)
+    except Exception as e:
+        logging.getLogger(__name__).debug(f"Shared state unavailable: {e}")
+        return None
+
+
+def _shared_value(state, config, key):
+    """Fresh shared-state sample for key, or None"""
+    if state is None:
+        return None
+    try:
+        return state.get(key, max_age=config.state_poll_interval * 3)
+    except Exception as e:
+        logging.getLogger(__name__).debug(f"Shared state unavailable: {e}")
+        return None
+
+
+def _shared_sample(config, key, fetch):
+    """Fresh sample published by a running web UI leader, else fetch() directly"""
+    value = _shared_value(_open_shared_state(config), config, key)
+    return fetch() if value is None else value
+
+
+def _invalidate_shared(config, *keys):
+    """Drop samples published by a running web UI that a CLI write made stale"""
+    shared.invalidate(_open_shared_state(config), *keys)
+
+
 @cli.command()
 @click.pass_context
 def status(ctx):
     """Get proxy status and system information"""
     client = ctx.obj['client']
+    config = ctx.obj['config']
     logger = ctx.obj['logger']
     
     click.echo("Getting status...")
     
     # Get proxy status
-    proxy_status = client.get_proxy_status()
+    proxy_status = _shared_sample(config, shared.PROXY_STATUS, client.get_proxy_status)
     click.echo("\n" + click.style("Proxy Status:", fg="cyan", bold=True))
     click.echo(format_json(proxy_status))
     
+    # Get proxy pool status when more than one port is configured
+    if len(config.proxy_ports or []) > 1:
+        pool_status = _shared_sample(
+            config, shared.PROXY_POOL_STATUS, lambda: ProxyPool(client, config.proxy_ports).status()
+        )
+        aggregate = pool_status["aggregate"]
+        click.echo("\n" + click.style("Proxy Pool:", fg="cyan", bold=True))
+        print_table(
+            [{"port": port, **port_status} for port, port_status in pool_status["ports"].items()],
+            headers=["port", "status", *ProxyPool.THROUGHPUT_KEYS]
+        )
+        click.echo(f"\nAggregate: {aggregate['running']}/{aggregate['total']} running, "
+                   + ", ".join(f"{key}={aggregate[key]}" for key in ProxyPool.THROUGHPUT_KEYS))
+    
     # Get system info
     sys_info = client.get_system_info()
     click.echo("\n" + click.style("System Information:", fg="cyan", bold=True))
     click.echo(format_json(sys_info))
     
     # Get local system stats
-    local_stats = get_system_stats()
+    local_stats = _shared_sample(config, shared.SYSTEM_STATS, get_system_stats)
     click.echo("\n" + click.style("Local System Stats:", fg="cyan", bold=True))
     click.echo(format_json(local_stats))
 
 
+# Columns shown for intercepted requests
+REQUEST_COLUMNS = ['id', 'method', 'url', 'status', 'size']
+
+
+def _request_rows(requests_list, output_format):
+    """Rows and headers for intercepted requests in an output format
+
+    Display defaults apply to the table only; csv gets the raw columns and
+    json/jsonl get the full request objects.
+    """
+    if output_format == 'json' or output_format == 'jsonl':
+        return requests_list, None
+    if output_format == 'csv':
+        return requests_list, REQUEST_COLUMNS
+    rows = ({
+        'id': req.get('id', '-'),
+        'method': req.get('method', 'UNKNOWN'),
+        'url': req.get('url', 'N/A'),
+        'status': req.get('status', 'pending'),
+        'size': req.get('size', 'N/A'),
+    } for req in requests_list)
+    return rows, REQUEST_COLUMNS
+
+
 @cli.command()
 @click.option('--limit', type=int, default=10, help='Number of requests to show')
+@click.option('--output', '-o', 'output_format', type=click.Choice(output.FORMATS), default='table',
+              help='Output format (default: table)')
+@click.option('--pager', is_flag=True, help='Page the output')
+@click.option('--max-width', type=click.IntRange(min=2), default=None,
+              help='Truncate table cells wider than this (default: never)')
+@click.option('--follow', '-f', is_flag=True, help='Keep streaming new requests as they arrive')
+@click.option('--interval', type=click.FloatRange(min=0.05), default=0.5,
+              help='With --follow, seconds between polls (default: 0.5)')
 @click.pass_context
-def requests(ctx, limit):
+def requests(ctx, limit, output_format, pager, max_width, follow, interval):
     """Show intercepted requests"""
     client = ctx.obj['client']
     logger = ctx.obj['logger']
     
-    click.echo(f"Fetching last {limit} intercepted requests...")
+    if follow:
+        _follow_requests(client, ctx.obj['config'], limit, output_format, interval)
+        return
+    
+    # Keep stdout clean for machine-readable formats
+    to_stderr = output_format != 'table'
+    click.echo(f"Fetching last {limit} intercepted requests...", err=to_stderr)
     
     result = client.get_intercepted_requests(limit=limit)
     
     if result.get("status") == "success":
         requests_list = result.get("requests", [])
         if requests_list:
-            # Simple table format
-            click.echo("\n" + click.style("Intercepted Requests:", fg="cyan", bold=True))
-            for i, req in enumerate(requests_list, 1):
-                click.echo(f"\n[{i}] {req.get('method', 'UNKNOWN')} {req.get('url', 'N/A')}")
-                click.echo(f"    Status: {req.get('status', 'pending')}")
-                click.echo(f"    Size: {req.get('size', 'N/A')} bytes")
+            if output_format == 'table':
+                click.echo("\n" + click.style("Intercepted Requests:", fg="cyan", bold=True))
+            rows, headers = _request_rows(requests_list, output_format)
+            try:
+                output.write_rows(rows, headers, fmt=output_format, pager=pager, max_width=max_width)
+            except BrokenPipeError:
+                pass
         else:
-            click.echo(warning_message("No intercepted requests found"))
+            click.echo(warning_message("No intercepted requests found"), err=to_stderr)
     else:
-        click.echo(error_message(f"Failed to get requests: {result.get('message')}"))
+        click.echo(error_message(f"Failed to get requests: {result.get('message')}"), err=to_stderr)
+
+
+def _follow_requests(client, config, backlog, output_format, interval):
+    """Stream new intercepted requests to stdout until interrupted"""
+    # A JSON array never closes on an endless stream, so use JSON Lines
+    fmt = 'jsonl' if output_format == 'json' else output_format
+    
+    # Skip upstream polls while a web UI leader reports no newer request
+    state = _open_shared_state(config)
+    
+    def latest_id():
+        # Only trust a sample taken within the last interval; an older one
+        # could miss requests that arrived since, adding the leader's period
+        # to the follow latency
+        if state is None:
+            return None
+        try:
+            cursor, age = state.get_with_age(shared.REQUESTS_CURSOR)
+        except Exception as e:
+            logging.getLogger(__name__).debug(f"Shared state unavailable: {e}")
+            return None
+        if cursor is None or age >= interval:
+            return None
+        return cursor.get("id")
+    
+    followed = client.follow_requests(interval=interval, backlog=backlog, latest_id=latest_id)
+    rows, headers = _request_rows(followed, fmt)
+    try:
+        if fmt == 'table':
+            # Column widths are unknown up front, so stream one line per request
+            for row in rows:
+                click.echo(" ".join(str(row[column]) for column in REQUEST_COLUMNS))
+                sys.stdout.flush()
+        else:
+            output.write_rows(rows, headers, fmt=fmt, chunk_rows=1)
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+
+
+@cli.command()
+@click.option('--limit', type=int, default=100000, help='Number of requests to analyze')
+@click.option('--bucket', type=click.IntRange(min=1), default=60, help='Timeline bucket size in seconds')
+@click.option('--top', type=click.IntRange(min=1), default=10, help='Number of top hosts to show')
+@click.option('--json', 'as_json', is_flag=True, help='Print the raw analytics as JSON')
+@click.pass_context
+def analyze(ctx, limit, bucket, top, as_json):
+    """Analyze captured traffic (hosts, status codes, sizes, request rate)"""
+    client = ctx.obj['client']
+    logger = ctx.obj['logger']
+    
+    # Keep stdout clean for --json
+    to_stderr = as_json
+    click.echo(f"Analyzing last {limit} intercepted requests...", err=to_stderr)
+    
+    result = client.get_intercepted_requests(limit=limit)
+    
+    if result.get("status") != "success":
+        click.echo(error_message(f"Failed to get requests: {result.get('message')}"), err=to_stderr)
+        return
+    
+    try:
+        analytics = analyze_requests(result.get("requests", []), bucket_seconds=bucket, top=top)
+    except (RuntimeError, ValueError) as e:
+        click.echo(error_message(str(e)), err=to_stderr)
+        logger.error(f"Analytics failed: {e}")
+        return
+    
+    if as_json:
+        click.echo(format_json(analytics))
+        return
+    
+    if not analytics["total_requests"]:
+        click.echo(warning_message("No intercepted requests found"))
+        return
+    
+    click.echo(f"\nTotal requests: {analytics['total_requests']}")
+    
+    click.echo("\n" + click.style("Top Hosts:", fg="cyan", bold=True))
+    print_table(analytics["top_hosts"], headers=["value", "count"])
+    
+    click.echo("\n" + click.style("Status Codes:", fg="cyan", bold=True))
+    print_table(analytics["status_codes"] + analytics["status_classes"], headers=["value", "count"])
+    
+    click.echo("\n" + click.style("Methods:", fg="cyan", bold=True))
+    print_table(analytics["methods"], headers=["value", "count"])
+    
+    click.echo("\n" + click.style("Sizes (bytes):", fg="cyan", bold=True))
+    click.echo(format_json(analytics["sizes"]))
+    
+    click.echo("\n" + click.style(f"Request Rate (per {bucket}s):", fg="cyan", bold=True))
+    print_table(
+        [{"start": datetime.fromtimestamp(b["start"]).strftime("%Y-%m-%d %H:%M:%S"), "count": b["count"]}
+         for b in analytics["timeline"]],
+        headers=["start", "count"]
+    )
 
 
 @cli.command()
@@ -198,6 +471,7 @@ def config_set(ctx, key, value):
         parsed_value = value
     
     config.update(**{key: parsed_value})
+    _invalidate_shared(config, shared.PROXY_POOL_STATUS)
     click.echo(success_message(f"Configuration updated: {key} = {parsed_value}"))
     logger.info(f"Config updated: {key} = {parsed_value}")
 
@@ -21,6 +21,7 @@ class Config:
         self.config_path = config_path or self.DEFAULT_CONFIG_PATH
         self.config_dir = os.path.dirname(self.config_path)
         self.log_dir = self.DEFAULT_LOG_PATH
+        self._mtime = None
         
         # Create directories if they don't exist
         self._ensure_directories()
@@ -31,9 +32,12 @@ class Config:
             "timeout": 10,
             "log_level": "INFO",
             "proxy_port": 8888,
+            "proxy_ports": [8888],
             "enable_web_ui": True,
             "web_ui_port": 5000,
             "auto_start_proxy": False,
+            "shared_state": True,
+            "state_poll_interval": 2,
         }
         
         # Load configuration
@@ -48,6 +52,7 @@ class Config:
         """Load configuration from file or use defaults"""
         if os.path.exists(self.config_path):
             try:
+                self._mtime = os.path.getmtime(self.config_path)
                 with open(self.config_path, 'r') as f:
                     loaded_config = yaml.safe_load(f) or {}
                 # Merge with defaults
@@ -67,6 +72,7 @@ class Config:
         try:
             with open(self.config_path, 'w') as f:
                 yaml.dump(config, f, default_flow_style=False)
+            self._mtime = os.path.getmtime(self.config_path)
             logger.info(f"Configuration saved to {self.config_path}")
         except Exception as e:
             logger.error(f"Failed to save config: {e}")
@@ -83,6 +89,17 @@ class Config:
         self._save_config(self.config)
         logger.info(f"Configuration updated: {kwargs}")
 
+    def reload_if_changed(self) -> bool:
+        """Reload from disk if another process changed the file; return True if reloaded"""
+        try:
+            mtime = os.path.getmtime(self.config_path)
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        self.config = self._load_config()
+        return True
+
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value"""
         return self.config.get(key, default)
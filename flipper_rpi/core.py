@@ -4,8 +4,13 @@ Core FlipperHTTP functionality wrapper
 
 import requests
 import logging
-from typing import Optional, Dict, Any
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Iterator, Callable
 from .config import Config
+from . import wire
 
 logger = logging.getLogger(__name__)
 
@@ -15,10 +20,19 @@ class FlipperHTTPClient:
 
     def __init__(self, config: Config):
         self.config = config
-        self.session = requests.Session()
+        self._local = threading.local()
         self.base_url = config.flipper_url
         self.timeout = config.timeout
 
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session for the current thread (requests.Session is not thread-safe)"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
+
     def connect(self) -> bool:
         """Test connection to FlipperHTTP"""
         try:
@@ -45,11 +59,12 @@ class FlipperHTTPClient:
             logger.error(f"Failed to start proxy: {e}")
             return {"status": "error", "message": str(e)}
 
-    def stop_proxy(self) -> Dict[str, Any]:
-        """Stop the HTTP proxy"""
+    def stop_proxy(self, port: Optional[int] = None) -> Dict[str, Any]:
+        """Stop the HTTP proxy (only the listener on port, if given)"""
         try:
             response = self.session.post(
                 f"{self.base_url}/api/proxy/stop",
+                json={"port": port} if port is not None else None,
                 timeout=self.timeout
             )
             response.raise_for_status()
@@ -58,11 +73,12 @@ class FlipperHTTPClient:
             logger.error(f"Failed to stop proxy: {e}")
             return {"status": "error", "message": str(e)}
 
-    def get_proxy_status(self) -> Dict[str, Any]:
-        """Get current proxy status"""
+    def get_proxy_status(self, port: Optional[int] = None) -> Dict[str, Any]:
+        """Get current proxy status (for the listener on port, if given)"""
         try:
             response = self.session.get(
                 f"{self.base_url}/api/proxy/status",
+                params={"port": port} if port is not None else None,
                 timeout=self.timeout
             )
             response.raise_for_status()
@@ -71,20 +87,70 @@ class FlipperHTTPClient:
             logger.error(f"Failed to get proxy status: {e}")
             return {"status": "error", "message": str(e)}
 
-    def get_intercepted_requests(self, limit: int = 50) -> Dict[str, Any]:
-        """Get list of intercepted requests"""
+    def get_intercepted_requests(self, limit: int = 50, since: Optional[str] = None) -> Dict[str, Any]:
+        """Get list of intercepted requests (newer than request ID since, if given)"""
+        params = {"limit": limit}
+        if since is not None:
+            params["since"] = since
         try:
             response = self.session.get(
                 f"{self.base_url}/api/requests",
-                params={"limit": limit},
+                params=params,
+                headers={"Accept": wire.ACCEPT_HEADER},
                 timeout=self.timeout
             )
             response.raise_for_status()
-            return response.json()
+            return wire.decode(response.content, response.headers.get("Content-Type"))
         except Exception as e:
             logger.error(f"Failed to get requests: {e}")
             return {"status": "error", "message": str(e)}
 
+    def follow_requests(self, interval: float = 0.5, limit: int = 100, backlog: int = 10,
+                        max_seen: int = 10000,
+                        latest_id: Optional[Callable[[], Optional[str]]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield newly intercepted requests as they arrive, oldest first
+
+        Starts with the last backlog requests, then polls over the session's
+        keep-alive connection, passing the last seen request ID as a cursor and
+        dropping duplicates with a bounded seen-set. A full page containing new
+        requests is followed by an immediate re-poll instead of waiting.
+
+        latest_id, if given, returns the newest request ID known elsewhere (e.g.
+        the shared-state cursor) or None; polls are skipped while it matches.
+        """
+        page = max(limit, backlog)
+        seen = SeenIds(max(max_seen, page * 2))
+        cursor = None
+        first = True
+        while True:
+            if not first and cursor is not None and latest_id is not None and latest_id() == cursor:
+                time.sleep(interval)
+                continue
+            result = self.get_intercepted_requests(limit=page, since=cursor)
+            drain = False
+            if result.get("status") == "success":
+                requests_list = result.get("requests", [])
+                skip = max(len(requests_list) - backlog, 0) if first else 0
+                new = 0
+                for i, req in enumerate(requests_list):
+                    if not seen.add(request_key(req)):
+                        continue
+                    new += 1
+                    if req.get("id") is not None:
+                        cursor = str(req["id"])
+                    if i >= skip:
+                        yield req
+                full = len(requests_list) >= page
+                drain = full and new > 0
+                if full and not first and new == len(requests_list):
+                    logger.warning(
+                        f"Received a full page of {page} new requests; "
+                        "some requests may have been missed (try a shorter --interval)"
+                    )
+                first = False
+            if not drain:
+                time.sleep(interval)
+
     def forward_request(self, request_id: str, modified_body: Optional[str] = None) -> Dict[str, Any]:
         """Forward an intercepted request"""
         try:
@@ -128,3 +194,85 @@ class FlipperHTTPClient:
         except Exception as e:
             logger.error(f"Failed to set proxy rules: {e}")
             return {"status": "error", "message": str(e)}
+
+
+def request_key(req: Dict[str, Any]) -> Any:
+    """Deduplication key for an intercepted request"""
+    if req.get("id") is not None:
+        return req["id"]
+    return (req.get("method"), req.get("url"), req.get("timestamp"))
+
+
+class SeenIds:
+    """Set of recently seen keys that forgets the oldest beyond maxlen"""
+
+    def __init__(self, maxlen: int = 10000):
+        self._order = deque()
+        self._keys = set()
+        self.maxlen = maxlen
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: Any) -> bool:
+        """Add key, returning False if it was already seen"""
+        if key in self._keys:
+            return False
+        self._order.append(key)
+        self._keys.add(key)
+        if len(self._order) > self.maxlen:
+            self._keys.discard(self._order.popleft())
+        return True
+
+
+class ProxyPool:
+    """Manage several proxy listener ports concurrently"""
+
+    # Counters summed across ports for the aggregate throughput view
+    THROUGHPUT_KEYS = ("requests", "bytes_in", "bytes_out")
+
+    def __init__(self, client: FlipperHTTPClient, ports: List[int]):
+        self.client = client
+        self.ports = list(dict.fromkeys(ports))
+
+    def _map(self, func) -> Dict[int, Dict[str, Any]]:
+        """Run func(port) for every port in parallel, keyed by port"""
+        if not self.ports:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(self.ports)) as executor:
+            results = executor.map(func, self.ports)
+            return dict(zip(self.ports, results))
+
+    def start(self) -> Dict[int, Dict[str, Any]]:
+        """Start a proxy listener on every port in the pool"""
+        return self._map(lambda port: self.client.start_proxy(port=port))
+
+    def stop(self) -> Dict[int, Dict[str, Any]]:
+        """Stop the proxy listener on every port in the pool"""
+        return self._map(lambda port: self.client.stop_proxy(port=port))
+
+    def status(self) -> Dict[str, Any]:
+        """Get per-port status plus aggregate throughput for the pool"""
+        ports = self._map(lambda port: self.client.get_proxy_status(port=port))
+
+        aggregate = {key: 0 for key in self.THROUGHPUT_KEYS}
+        running = 0
+        for port_status in ports.values():
+            if port_status.get("status") == "running":
+                running += 1
+            for key in self.THROUGHPUT_KEYS:
+                value = port_status.get(key)
+                if isinstance(value, (int, float)):
+                    aggregate[key] += value
+
+        aggregate["running"] = running
+        aggregate["total"] = len(ports)
+        return {
+            "status": "success",
+            "healthy": running == len(ports),
+            "aggregate": aggregate,
+            "ports": {str(port): port_status for port, port_status in ports.items()},
+        }
@@ -0,0 +1,155 @@
+"""
+Buffered, streaming output rendering for CLI tables and machine-readable formats
+"""
+
+import csv
+import io
+import sys
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+import click
+
+from . import wire
+
+FORMATS = ("table", "json", "jsonl", "csv")
+
+# Rows sampled to estimate table column widths; later rows are not measured
+# and simply overflow their column if wider
+SAMPLE_ROWS = 1000
+# Rows joined into a single write
+CHUNK_ROWS = 1000
+
+
+def _cells(row: Dict[str, Any], headers: List[str]) -> List[str]:
+    """Stringify a table row's cells (missing keys are blank)"""
+    return [str(row.get(header, "")) for header in headers]
+
+
+def _fit(text: str, width: int, max_width: Optional[int]) -> str:
+    """Pad text to width, truncating only past an explicit max_width"""
+    if max_width is not None and len(text) > max_width:
+        return text[:max_width - 1] + "…"
+    return text.ljust(width)
+
+
+def iter_table(rows: Iterable[Dict[str, Any]], headers: List[str],
+               sample_rows: int = SAMPLE_ROWS, max_width: Optional[int] = None) -> Iterator[str]:
+    """Yield table lines, sizing columns from the first sample_rows rows
+
+    Cells are never truncated unless max_width is given.
+    """
+    rows = iter(rows)
+    sample = [_cells(row, headers) for row in islice(rows, sample_rows)]
+
+    widths = [len(header) for header in headers]
+    for cells in sample:
+        for i, text in enumerate(cells):
+            if len(text) > widths[i]:
+                widths[i] = len(text)
+    if max_width is not None:
+        widths = [min(width, max_width) for width in widths]
+
+    def line(cells):
+        return " | ".join(_fit(text, width, max_width) for text, width in zip(cells, widths)) + "\n"
+
+    header_row = line(headers)
+    yield header_row
+    yield "-" * (len(header_row) - 1) + "\n"
+
+    for cells in sample:
+        yield line(cells)
+    for row in rows:
+        yield line(_cells(row, headers))
+
+
+def iter_jsonl(rows: Iterable[Dict[str, Any]], headers: Optional[List[str]] = None) -> Iterator[str]:
+    """Yield one compact JSON object per line (whole rows unless headers are given)"""
+    for row in rows:
+        if headers is not None:
+            row = {header: row.get(header) for header in headers}
+        yield wire.dumps_json(row).decode("utf-8") + "\n"
+
+
+def iter_json(rows: Iterable[Dict[str, Any]], headers: Optional[List[str]] = None) -> Iterator[str]:
+    """Yield a JSON array one element per line, without building it in memory"""
+    yield "["
+    separator = "\n"
+    for line in iter_jsonl(rows, headers):
+        yield separator + line.rstrip("\n")
+        separator = ",\n"
+    yield "\n]\n"
+
+
+def iter_csv(rows: Iterable[Dict[str, Any]], headers: List[str]) -> Iterator[str]:
+    """Yield CSV lines, header first"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(headers)
+    for row in rows:
+        writer.writerow(["" if row.get(header) is None else row.get(header) for header in headers])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_lines(rows: Iterable[Dict[str, Any]], headers: Optional[List[str]], fmt: str = "table",
+               sample_rows: int = SAMPLE_ROWS, max_width: Optional[int] = None) -> Iterator[str]:
+    """Yield rendered lines for the given output format"""
+    if fmt == "table":
+        return iter_table(rows, headers, sample_rows=sample_rows, max_width=max_width)
+    if fmt == "json":
+        return iter_json(rows, headers)
+    if fmt == "jsonl":
+        return iter_jsonl(rows, headers)
+    if fmt == "csv":
+        return iter_csv(rows, headers)
+    raise ValueError(f"Unknown output format: {fmt}")
+
+
+def iter_chunks(lines: Iterable[str], chunk_rows: int = CHUNK_ROWS) -> Iterator[str]:
+    """Join lines into chunks so each write covers many rows"""
+    lines = iter(lines)
+    while True:
+        chunk = "".join(islice(lines, chunk_rows))
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_rows(rows: Iterable[Dict[str, Any]], headers: Optional[List[str]] = None, fmt: str = "table",
+               stream: Optional[TextIO] = None, pager: bool = False, chunk_rows: int = CHUNK_ROWS,
+               sample_rows: int = SAMPLE_ROWS, max_width: Optional[int] = None):
+    """Render rows in fmt and write them in buffered chunks, optionally through a pager
+
+    Returns the number of rows written. For table and csv, headers default to
+    the first row's keys; json and jsonl emit whole rows unless headers are given.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return 0
+
+    if headers is None and fmt in ("table", "csv"):
+        headers = list(first.keys())
+
+    count = 0
+
+    def counted():
+        nonlocal count
+        for row in chain([first], rows):
+            count += 1
+            yield row
+
+    lines = iter_lines(counted(), headers, fmt, sample_rows=sample_rows, max_width=max_width)
+    chunks = iter_chunks(lines, chunk_rows)
+    if pager:
+        click.echo_via_pager(chunks)
+    else:
+        stream = stream or sys.stdout
+        for chunk in chunks:
+            stream.write(chunk)
+            stream.flush()
+    return count
@@ -0,0 +1,213 @@
+"""
+Shared state across web workers and CLI invocations, backed by local SQLite
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Optional, Tuple
+
+from . import wire
+from .analytics import capture_version
+from .core import ProxyPool
+from .utils import get_system_stats
+
+logger = logging.getLogger(__name__)
+
+# Keys written by the leader
+PROXY_STATUS = "proxy_status"
+PROXY_POOL_STATUS = "proxy_pool_status"
+SYSTEM_STATS = "system_stats"
+# {"id": newest request ID, "capture_version": analytics cache version}
+REQUESTS_CURSOR = "requests_cursor"
+# Keys made stale by starting or stopping proxies
+PROXY_KEYS = (PROXY_STATUS, PROXY_POOL_STATUS)
+
+# Seconds without readers after which the leader stops polling FlipperHTTP
+IDLE_TIMEOUT = 60
+
+
+class SharedState:
+    """Key/value samples in a WAL-mode SQLite file
+
+    Readers never block the writer or each other, so any number of web
+    workers and CLI invocations can read while one leader process writes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS state ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, updated REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS leader ("
+                "id INTEGER PRIMARY KEY CHECK (id = 1), holder TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connection for the current thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA mmap_size=8388608")
+            self._local.conn = conn
+        return conn
+
+    def set(self, key: str, value: Any):
+        """Store a value for key"""
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO state (key, value, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated = excluded.updated",
+                (key, wire.dumps_json(value), time.time())
+            )
+
+    def get_with_age(self, key: str) -> Tuple[Optional[Any], Optional[float]]:
+        """Return (value, age in seconds) for key, or (None, None) if unset"""
+        row = self._connection().execute(
+            "SELECT value, updated FROM state WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None, None
+        return wire.loads_json(row[0]), time.time() - row[1]
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[Any]:
+        """Return the value for key, or None if unset or older than max_age seconds"""
+        value, age = self.get_with_age(key)
+        if value is None or (max_age is not None and age > max_age):
+            return None
+        return value
+
+    def delete(self, *keys: str):
+        """Forget keys so readers fall back to fetching directly"""
+        with self._connection() as conn:
+            conn.executemany("DELETE FROM state WHERE key = ?", [(key,) for key in keys])
+
+    def acquire_leader(self, holder: str, ttl: float) -> bool:
+        """Become (or stay) leader for ttl seconds unless another live holder exists"""
+        now = time.time()
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "INSERT INTO leader (id, holder, expires) VALUES (1, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET holder = excluded.holder, expires = excluded.expires "
+                "WHERE leader.holder = excluded.holder OR leader.expires < ?",
+                (holder, now + ttl, now)
+            )
+            return cursor.rowcount == 1
+
+    def release_leader(self, holder: str):
+        """Give up leadership if held by holder"""
+        with self._connection() as conn:
+            conn.execute("DELETE FROM leader WHERE id = 1 AND holder = ?", (holder,))
+
+
+class StateSync:
+    """Background poller that writes FlipperHTTP samples when this process is leader
+
+    The thread starts on the first touch() and only competes for leadership
+    while this process has had readers within IDLE_TIMEOUT seconds, so an idle
+    web UI does not poll FlipperHTTP.
+
+    The lease is renewed before each upstream call in sample(), and its TTL
+    covers one interval plus the slowest single step (an upstream timeout or
+    the 1 second CPU sample), so a slow FlipperHTTP cannot let a second
+    leader take over mid-sample.
+    """
+
+    def __init__(self, state: SharedState, client, config, interval: float = 2.0):
+        self.state = state
+        self.client = client
+        self.config = config
+        self.interval = interval
+        self.holder = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._last_used = 0.0
+        self.lease_ttl = interval * 3 + max(config.timeout, 1) + 1
+
+    def touch(self):
+        """Record a reader and start polling if not already running"""
+        self._last_used = time.time()
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="flipper-state-sync", daemon=True)
+                    self._thread.start()
+
+    def stop(self):
+        """Stop polling and release leadership"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 2)
+        self.state.release_leader(self.holder)
+
+    def _run(self):
+        leading = False
+        while not self._stop.is_set():
+            try:
+                if time.time() - self._last_used > IDLE_TIMEOUT:
+                    if leading:
+                        self.state.release_leader(self.holder)
+                        leading = False
+                else:
+                    leading = self._renew()
+                    if leading:
+                        self.sample()
+            except Exception as e:
+                logger.error(f"State sync failed: {e}")
+            self._stop.wait(self.interval)
+
+    def _renew(self) -> bool:
+        """Acquire or extend the leader lease"""
+        return self.state.acquire_leader(self.holder, ttl=self.lease_ttl)
+
+    def sample(self):
+        """Poll FlipperHTTP once and publish the results, stopping if leadership is lost"""
+        self.state.set(PROXY_STATUS, self.client.get_proxy_status())
+        ports = self.config.proxy_ports or []
+        if ports:
+            if not self._renew():
+                return
+            self.state.set(PROXY_POOL_STATUS, ProxyPool(self.client, ports).status())
+        if not self._renew():
+            return
+        self.state.set(SYSTEM_STATS, get_system_stats())
+
+        if not self._renew():
+            return
+        result = self.client.get_intercepted_requests(limit=1)
+        if result.get("status") == "success":
+            requests_list = result.get("requests", [])
+            newest = requests_list[-1].get("id") if requests_list else None
+            self.state.set(REQUESTS_CURSOR, {
+                "id": None if newest is None else str(newest),
+                "capture_version": capture_version(result),
+            })
+
+
+def invalidate(state: Optional[SharedState], *keys: str):
+    """Drop samples made stale by a write so the next read fetches directly
+
+    Does nothing without shared state; failures are logged, never raised.
+    """
+    if state is None:
+        return
+    try:
+        state.delete(*keys)
+    except Exception as e:
+        logger.warning(f"Shared state invalidation failed: {e}")
+
+
+def default_state_path(config) -> str:
+    """Shared state file for a config"""
+    return config.shared_state_path or os.path.join(config.config_dir, "state.db")
@@ -4,10 +4,12 @@ Utility functions for Flipper RPi Control
 
 import logging
 import json
+import sys
 from typing import Any, Dict
 from datetime import datetime
 from pathlib import Path
 import psutil
+from . import output
 
 
 def setup_logging(log_dir: str, log_level: str = "INFO"):
@@ -34,23 +36,7 @@ def print_table(data: list[Dict[str, Any]], headers: list[str] = None):
         print("No data to display")
         return
     
-    if headers is None:
-        headers = list(data[0].keys())
-    
-    # Calculate column widths
-    col_widths = {header: len(header) for header in headers}
-    for row in data:
-        for header in headers:
-            col_widths[header] = max(col_widths[header], len(str(row.get(header, ""))))
-    
-    # Print header
-    header_row = " | ".join(header.ljust(col_widths[header]) for header in headers)
-    print(header_row)
-    print("-" * len(header_row))
-    
-    # Print rows
-    for row in data:
-        print(" | ".join(str(row.get(header, "")).ljust(col_widths[header]) for header in headers))
+    output.write_rows(data, headers, fmt="table", stream=sys.stdout, sample_rows=len(data))
 
 
 def format_json(data: Any, indent: int = 2) -> str:
@@ -88,6 +74,21 @@ def validate_port(port: int) -> bool:
     return True
 
 
+def parse_ports(value: str) -> list[int]:
+    """Parse a comma-separated port list such as '8888,8889,9999'"""
+    ports = []
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if not part.isdigit():
+            raise ValueError(f"Invalid port: {part}")
+        ports.append(int(part))
+    if not ports:
+        raise ValueError(f"No ports given: {value!r}")
+    return ports
+
+
 def format_bytes(bytes_val: int) -> str:
     """Format bytes to human readable format"""
     for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
@@ -2,11 +2,14 @@
 Web UI for Flipper RPi Control
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request
 import logging
 from .config import Config
-from .core import FlipperHTTPClient
+from .core import FlipperHTTPClient, ProxyPool
+from .analytics import AnalyticsCache, capture_version
+from . import state as shared
 from .utils import get_system_stats
+from . import wire
 
 
 def create_app(config: Config = None):
@@ -17,11 +20,55 @@ def create_app(config: Config = None):
     
     app = Flask(__name__)
     client = FlipperHTTPClient(config)
+    analytics_cache = AnalyticsCache()
     logger = logging.getLogger(__name__)
     
+    # Share FlipperHTTP samples across workers: one leader polls, everyone reads.
+    # Polling only starts once a shared value is first read.
+    state = sync = None
+    if config.shared_state:
+        try:
+            state = shared.SharedState(shared.default_state_path(config))
+            sync = shared.StateSync(state, client, config, interval=config.state_poll_interval)
+        except Exception as e:
+            logger.warning(f"Shared state disabled: {e}")
+            state = None
+    
     # Store config and client in app context
     app.config['flipper_config'] = config
     app.config['flipper_client'] = client
+    app.config['flipper_state'] = state
+    app.config['flipper_state_sync'] = sync
+    
+    def shared_value(key):
+        """Fresh shared-state sample for key, or None"""
+        if state is None:
+            return None
+        sync.touch()
+        try:
+            return state.get(key, max_age=config.state_poll_interval * 3)
+        except Exception as e:
+            logger.warning(f"Shared state read failed: {e}")
+            return None
+    
+    def cached(key, fetch):
+        """Fresh shared-state sample for key, falling back to fetch()"""
+        value = shared_value(key)
+        return fetch() if value is None else value
+    
+    @app.before_request
+    def refresh_config():
+        """Pick up config changes made by other workers or the CLI"""
+        if config.reload_if_changed():
+            client.base_url = config.flipper_url
+            client.timeout = config.timeout
+    
+    def negotiated(data):
+        """Encode data in the best wire format the caller accepts"""
+        mimetype = request.accept_mimetypes.best_match(wire.SUPPORTED_MIMETYPES) or wire.JSON_MIMETYPE
+        response = Response(wire.encode(data, mimetype), mimetype=mimetype)
+        response.vary.add('Accept')
+        return response
     
     @app.route('/')
     def index():
@@ -36,25 +83,118 @@ def create_app(config: Config = None):
     @app.route('/api/proxy/status')
     def proxy_status():
         """Get proxy status"""
-        return jsonify(client.get_proxy_status())
+        return jsonify(cached(shared.PROXY_STATUS, client.get_proxy_status))
     
     @app.route('/api/proxy/start', methods=['POST'])
     def start_proxy():
         """Start proxy"""
         data = request.get_json() or {}
         port = data.get('port', 8888)
-        return jsonify(client.start_proxy(port=port))
+        result = client.start_proxy(port=port)
+        shared.invalidate(state, *shared.PROXY_KEYS)
+        return jsonify(result)
     
     @app.route('/api/proxy/stop', methods=['POST'])
     def stop_proxy():
         """Stop proxy"""
-        return jsonify(client.stop_proxy())
+        result = client.stop_proxy()
+        shared.invalidate(state, *shared.PROXY_KEYS)
+        return jsonify(result)
+    
+    def _pool_ports():
+        """Ports from the request body, falling back to the configured pool"""
+        data = request.get_json(silent=True) or {}
+        return [int(port) for port in data.get('ports') or config.proxy_ports or []]
+    
+    @app.route('/api/proxy/pool/status')
+    def proxy_pool_status():
+        """Get per-port and aggregate status for the proxy pool"""
+        return jsonify(cached(
+            shared.PROXY_POOL_STATUS,
+            lambda: ProxyPool(client, config.proxy_ports or []).status()
+        ))
+    
+    @app.route('/api/proxy/pool/start', methods=['POST'])
+    def start_proxy_pool():
+        """Start every port in the proxy pool"""
+        try:
+            ports = _pool_ports()
+        except (TypeError, ValueError):
+            return jsonify({"status": "error", "message": "ports must be a list of integers"}), 400
+        
+        pool = ProxyPool(client, ports)
+        results = pool.start()
+        failed = [port for port, result in results.items() if result.get("status") != "success"]
+        # Keep every requested port in the pool, even if some failed to start
+        config.update(proxy_ports=pool.ports)
+        shared.invalidate(state, *shared.PROXY_KEYS)
+        return jsonify({
+            "status": "error" if failed else "success",
+            "failed": failed,
+            "ports": {str(port): result for port, result in results.items()},
+        })
+    
+    @app.route('/api/proxy/pool/stop', methods=['POST'])
+    def stop_proxy_pool():
+        """Stop every port in the proxy pool"""
+        try:
+            ports = _pool_ports()
+        except (TypeError, ValueError):
+            return jsonify({"status": "error", "message": "ports must be a list of integers"}), 400
+        
+        results = ProxyPool(client, ports).stop()
+        shared.invalidate(state, *shared.PROXY_KEYS)
+        ok = all(result.get("status") == "success" for result in results.values())
+        return jsonify({
+            "status": "success" if ok else "error",
+            "ports": {str(port): result for port, result in results.items()},
+        })
     
     @app.route('/api/requests')
     def get_requests():
         """Get intercepted requests"""
         limit = request.args.get('limit', 50, type=int)
-        return jsonify(client.get_intercepted_requests(limit=limit))
+        return negotiated(client.get_intercepted_requests(limit=limit))
+    
+    @app.route('/api/analytics')
+    def get_analytics():
+        """Get host, status, size and request-rate analytics for the capture"""
+        limit = request.args.get('limit', 100000, type=int)
+        bucket = request.args.get('bucket', 60, type=int)
+        top = request.args.get('top', 10, type=int)
+        
+        if bucket < 1 or top < 1:
+            return jsonify({"status": "error", "message": "bucket and top must be positive"}), 400
+        
+        # Identify the capture cheaply (leader's cursor, else a limit=1 probe);
+        # the full list is only fetched on a cache miss
+        cursor = shared_value(shared.REQUESTS_CURSOR)
+        if cursor is not None:
+            version = cursor["capture_version"]
+        else:
+            probe = client.get_intercepted_requests(limit=1)
+            if probe.get("status") != "success":
+                return jsonify(probe), 502
+            version = capture_version(probe)
+        
+        def fetch():
+            result = client.get_intercepted_requests(limit=limit)
+            if result.get("status") != "success":
+                raise ConnectionError(result.get("message"))
+            return result.get("requests", [])
+        
+        try:
+            analytics = analytics_cache.get(
+                version, fetch, bucket_seconds=bucket, top=top, limit=limit
+            )
+        except ConnectionError as e:
+            return jsonify({"status": "error", "message": str(e)}), 502
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        except RuntimeError as e:
+            return jsonify({"status": "error", "message": str(e)}), 501
+        
+        return negotiated({"status": "success", **analytics})
     
     @app.route('/api/requests/forward', methods=['POST'])
     def forward_request():
@@ -76,7 +216,7 @@ def create_app(config: Config = None):
     @app.route('/api/system/stats')
     def system_stats():
         """Get local system statistics"""
-        return jsonify(get_system_stats())
+        return jsonify(cached(shared.SYSTEM_STATS, get_system_stats))
     
     @app.route('/api/config')
     def get_config():
@@ -89,6 +229,7 @@ def create_app(config: Config = None):
         data = request.get_json() or {}
         try:
             config.update(**data)
+            shared.invalidate(state, shared.PROXY_POOL_STATUS)
             return jsonify({"status": "success", "config": config.to_dict()})
         except Exception as e:
             return jsonify({"status": "error", "message": str(e)}), 400
@@ -0,0 +1,74 @@
+"""
+Wire formats for traffic between FlipperHTTPClient, the web API and the dashboard
+"""
+
+import json
+from typing import Any
+
+try:
+    import msgpack
+except ImportError:  # optional: pip install flipper-rpi-control[fast]
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:  # optional: pip install flipper-rpi-control[fast]
+    orjson = None
+
+
+JSON_MIMETYPE = "application/json"
+MSGPACK_MIMETYPE = "application/msgpack"
+
+# Formats this process can produce, in order of server preference for equal quality
+SUPPORTED_MIMETYPES = [JSON_MIMETYPE] + ([MSGPACK_MIMETYPE] if msgpack else [])
+
+# Accept header sent by the client. orjson encodes and decodes request lists
+# faster than msgpack (see benchmarks/bench_wire.py), so JSON is preferred when
+# it is installed and msgpack is only favoured over stdlib json.
+if msgpack is None:
+    ACCEPT_HEADER = JSON_MIMETYPE
+elif orjson is not None:
+    ACCEPT_HEADER = f"{JSON_MIMETYPE}, {MSGPACK_MIMETYPE};q=0.9"
+else:
+    ACCEPT_HEADER = f"{MSGPACK_MIMETYPE}, {JSON_MIMETYPE};q=0.9"
+
+
+def dumps_json(data: Any, indent: int = None) -> bytes:
+    """Encode data as JSON bytes, using orjson when installed"""
+    if orjson is not None and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(data, default=str, option=option)
+        except TypeError:
+            # e.g. integers beyond 64 bits, which the stdlib handles
+            pass
+    separators = None if indent else (",", ":")
+    return json.dumps(data, indent=indent, separators=separators, default=str).encode("utf-8")
+
+
+def loads_json(content: bytes) -> Any:
+    """Decode JSON bytes, using orjson when installed"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def encode(data: Any, mimetype: str = JSON_MIMETYPE) -> bytes:
+    """Encode data for the given mimetype"""
+    if mimetype == MSGPACK_MIMETYPE:
+        if msgpack is None:
+            raise ValueError("msgpack is not installed")
+        return msgpack.packb(data, default=str, use_bin_type=True)
+    return dumps_json(data)
+
+
+def decode(content: bytes, mimetype: str = JSON_MIMETYPE) -> Any:
+    """Decode content according to its mimetype (a Content-Type header is accepted)"""
+    mimetype = (mimetype or JSON_MIMETYPE).split(";")[0].strip().lower()
+    if mimetype == MSGPACK_MIMETYPE:
+        if msgpack is None:
+            raise ValueError("msgpack is not installed")
+        return msgpack.unpackb(content, raw=False)
+    return loads_json(content)
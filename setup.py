@@ -34,6 +34,18 @@ setup(
         "flask>=2.3.0",
         "psutil>=5.9.0",
     ],
+    extras_require={
+        "fast": [
+            "msgpack>=1.0.0",
+            "orjson>=3.9.0",
+        ],
+        "analytics": [
+            "numpy>=1.24.0",
+        ],
+        "dev": [
+            "pytest>=7.0.0",
+        ],
+    },
     entry_points={
         "console_scripts": [
             "flipper-rpi=flipper_rpi.cli:main",
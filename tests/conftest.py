@@ -0,0 +1,76 @@
+"""
+Shared fixtures for Flipper RPi Control tests
+"""
+
+import pytest
+
+from flipper_rpi.config import Config
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    """Config stored under a temporary directory"""
+    monkeypatch.setattr(Config, "DEFAULT_LOG_PATH", str(tmp_path / "logs"))
+    return Config(config_path=str(tmp_path / "config.yaml"))
+
+
+class FakeClient:
+    """Stand-in for FlipperHTTPClient that records calls and returns canned replies"""
+
+    def __init__(self, config=None, requests_list=None):
+        self.config = config
+        self.requests_list = list(requests_list or [])
+        self.calls = []
+        self.port_status = {}
+        self.failing_ports = set()
+
+    def start_proxy(self, port=8080):
+        self.calls.append(("start_proxy", port))
+        if port in self.failing_ports:
+            return {"status": "error", "message": "boom"}
+        return {"status": "success"}
+
+    def stop_proxy(self, port=None):
+        self.calls.append(("stop_proxy", port))
+        return {"status": "success"}
+
+    def get_proxy_status(self, port=None):
+        self.calls.append(("get_proxy_status", port))
+        return self.port_status.get(port, {"status": "stopped"})
+
+    def get_intercepted_requests(self, limit=50, since=None):
+        self.calls.append(("get_intercepted_requests", limit))
+        return {"status": "success", "requests": self.requests_list[-limit:]}
+
+    def get_system_info(self):
+        return {"status": "success"}
+
+
+@pytest.fixture
+def fake_client():
+    return FakeClient()
+
+
+@pytest.fixture
+def make_app(config, monkeypatch):
+    """Factory for a Flask app backed by a FakeClient (exposed as app.fake_client)
+
+    Shared state is off unless shared_state=True, in which case the sync
+    thread is never started.
+    """
+    pytest.importorskip("flask")
+    from flipper_rpi import web
+    from flipper_rpi.state import StateSync
+
+    def make(requests_list=None, shared_state=False):
+        client = FakeClient(requests_list=requests_list)
+        monkeypatch.setattr(web, "FlipperHTTPClient", lambda cfg: client)
+        if shared_state:
+            monkeypatch.setattr(StateSync, "touch", lambda self: None)
+        else:
+            config.update(shared_state=False)
+        app = web.create_app(config)
+        app.fake_client = client
+        return app
+
+    return make
@@ -0,0 +1,121 @@
+"""
+Tests for flipper_rpi.analytics and /api/analytics
+"""
+
+import time
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from flipper_rpi import analytics
+from flipper_rpi.analytics import AnalyticsCache, analyze, capture_version
+
+
+REQUESTS = [
+    {"id": "r1", "method": "get", "url": "http://a.com/x", "status": 200, "size": 100, "timestamp": 1000},
+    {"id": "r2", "method": "POST", "url": "http://a.com/y", "status": 404, "size": 300, "timestamp": 1010},
+    {"id": "r3", "method": "GET", "url": "http://b.com/", "status": None, "size": "n/a", "timestamp": 1200},
+    {"id": "r4", "method": "GET", "url": "", "host": 5, "status": 500, "timestamp": "bad"},
+]
+
+
+def test_analyze_group_counts_and_sizes():
+    result = analyze(REQUESTS, bucket_seconds=60, top=2)
+
+    assert result["total_requests"] == 4
+    assert result["top_hosts"] == [{"value": "a.com", "count": 2}, {"value": "5", "count": 1}]
+    assert {"value": "GET", "count": 3} in result["methods"]
+    assert {"value": "pending", "count": 1} in result["status_codes"]
+    assert result["status_classes"] == [
+        {"value": "2xx", "count": 1}, {"value": "4xx", "count": 1}, {"value": "5xx", "count": 1},
+    ]
+    assert result["sizes"]["count"] == 2
+    assert result["sizes"]["p50"] == 200
+
+
+def test_timeline_only_emits_non_empty_buckets():
+    result = analyze(REQUESTS, bucket_seconds=60)
+
+    assert result["timeline"] == [{"start": 960.0, "count": 2}, {"start": 1200.0, "count": 1}]
+
+
+def test_timeline_rejects_huge_spans(monkeypatch):
+    monkeypatch.setattr(analytics, "MAX_TIMELINE_BUCKETS", 100)
+    with pytest.raises(ValueError):
+        analyze([{"timestamp": 0}, {"timestamp": 1_700_000_000}], bucket_seconds=1)
+
+
+def test_capture_version_uses_newest_request():
+    assert capture_version({"requests": REQUESTS[-1:]}) == "~r4:500:None"
+    assert capture_version({"capture_version": 7, "requests": []}) == "7"
+
+
+def test_capture_version_changes_when_newest_request_completes():
+    pending = {"requests": [{"id": "r5", "status": None}]}
+    done = {"requests": [{"id": "r5", "status": 200, "size": 10}]}
+
+    assert capture_version(pending) != capture_version(done)
+
+
+def test_non_finite_values_count_as_unknown():
+    result = analyze([
+        {"status": 200, "size": "inf", "timestamp": "inf"},
+        {"status": 200, "size": 1e400, "timestamp": 1e400},
+        {"status": 200, "size": 5, "timestamp": 60},
+    ])
+
+    assert result["sizes"]["count"] == 1
+    assert result["timeline"] == [{"start": 60.0, "count": 1}]
+
+
+def test_cache_only_fetches_on_miss():
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return REQUESTS
+
+    cache = AnalyticsCache()
+    first = cache.get("r4", fetch)
+    assert cache.get("r4", fetch) is first
+    cache.get("r5", fetch)
+
+    assert len(calls) == 2
+
+
+def test_cache_expires_derived_versions(monkeypatch):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return REQUESTS
+
+    cache = AnalyticsCache(derived_ttl=30)
+    cache.get("7", fetch)
+    cache.get("~r4:500:None", fetch)
+    monkeypatch.setattr(analytics.time, "time", lambda: time.time_ns() / 1e9 + 60)
+    cache.get("7", fetch)
+    cache.get("~r4:500:None", fetch)
+
+    assert len(calls) == 3
+
+
+def test_api_analytics_probes_before_fetching(make_app):
+    app = make_app(requests_list=REQUESTS)
+    client = app.fake_client
+    api = app.test_client()
+
+    assert api.get("/api/analytics").json["total_requests"] == 4
+    assert api.get("/api/analytics").status_code == 200
+    assert [call for call in client.calls if call[0] == "get_intercepted_requests"] == [
+        ("get_intercepted_requests", 1),
+        ("get_intercepted_requests", 100000),
+        ("get_intercepted_requests", 1),
+    ]
+
+
+def test_api_analytics_rejects_huge_timeline(make_app):
+    app = make_app(requests_list=[{"id": "a", "timestamp": 0}, {"id": "b", "timestamp": 1_700_000_000}])
+
+    assert app.test_client().get("/api/analytics?bucket=1").status_code == 400
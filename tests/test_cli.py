@@ -0,0 +1,134 @@
+"""
+Tests for flipper_rpi.cli
+"""
+
+import json
+import time
+
+import pytest
+from click.testing import CliRunner
+
+from flipper_rpi import cli as cli_module
+from flipper_rpi import state as shared
+from flipper_rpi.config import Config
+
+from conftest import FakeClient
+
+
+@pytest.fixture
+def run(config, monkeypatch):
+    """Invoke the CLI against a FakeClient and the temporary config"""
+    client = FakeClient()
+    monkeypatch.setattr(cli_module, "FlipperHTTPClient", lambda cfg: client)
+    monkeypatch.setattr(cli_module, "validate_port", lambda port: True)
+
+    def invoke(*args):
+        result = CliRunner().invoke(cli_module.cli, ["--config", config.config_path, *args], obj={})
+        return result, Config(config_path=config.config_path)
+
+    invoke.client = client
+    return invoke
+
+
+def test_start_proxy_pool_keeps_failed_ports_in_pool(run):
+    run.client.failing_ports = {8889}
+    result, config = run("start-proxy", "--ports", "8888,8889,9999")
+
+    assert result.exit_code == 0, result.output
+    assert "1 of 3 ports failed to start: 8889" in result.output
+    assert config.proxy_ports == [8888, 8889, 9999]
+
+
+def test_analyze_reports_oversized_timeline(run):
+    pytest.importorskip("numpy")
+    run.client.requests_list = [{"id": "a", "timestamp": 0}, {"id": "b", "timestamp": 1_700_000_000}]
+    result, _ = run("analyze", "--bucket", "1")
+
+    assert result.exit_code == 0, result.output
+    assert "use a larger bucket" in result.output
+
+
+def test_analyze_json_keeps_stdout_parseable(run):
+    pytest.importorskip("numpy")
+    run.client.requests_list = [{"id": "a", "status": 200, "timestamp": 0}]
+    result, _ = run("analyze", "--json")
+
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.stdout)["total_requests"] == 1
+    assert "Analyzing last" in result.stderr
+
+
+def test_requests_machine_formats_keep_raw_values(run):
+    run.client.requests_list = [{"id": "r1", "url": "http://a.com/", "timestamp": 5}]
+
+    result, _ = run("requests", "--output", "jsonl")
+    assert result.output.splitlines()[-1] == '{"id":"r1","url":"http://a.com/","timestamp":5}'
+
+    result, _ = run("requests", "--output", "csv")
+    assert result.output.splitlines()[-1] == "r1,,http://a.com/,,"
+
+
+def test_requests_table_shows_full_url(run):
+    url = "http://e.com/" + "x" * 150
+    run.client.requests_list = [{"id": "r1", "url": url}]
+    result, _ = run("requests")
+
+    assert url in result.output
+    assert "pending" in result.output
+
+
+def test_start_proxy_empty_ports_keeps_pool(run):
+    run("start-proxy", "--ports", "8888,8889")
+    result, config = run("start-proxy", "--ports", ",")
+
+    assert "No ports given" in result.output
+    assert config.proxy_ports == [8888, 8889]
+
+
+def test_start_proxy_rejects_port_with_ports(run):
+    result, _ = run("start-proxy", "--port", "7000", "--ports", "8888")
+
+    assert "not both" in result.output
+    assert run.client.calls == []
+
+
+def test_stop_proxy_all_warns_on_empty_pool(run, config):
+    config.update(proxy_ports=[])
+    result, _ = run("stop-proxy", "--all")
+
+    assert "No proxy pool configured" in result.output
+
+
+@pytest.fixture
+def shared_state(config):
+    """Shared state file as published by a running web UI"""
+    return shared.SharedState(shared.default_state_path(config))
+
+
+def test_proxy_writes_invalidate_shared_status(run, shared_state):
+    for args in (("start-proxy",), ("start-proxy", "--ports", "8888"), ("stop-proxy",),
+                 ("stop-proxy", "--all"), ("config-set", "--key", "proxy_port", "--value", "8890")):
+        shared_state.set(shared.PROXY_STATUS, {"status": "running"})
+        shared_state.set(shared.PROXY_POOL_STATUS, {"status": "success"})
+        result, _ = run(*args)
+
+        assert result.exit_code == 0, result.output
+        assert shared_state.get(shared.PROXY_POOL_STATUS) is None, args
+        if args[0] != "config-set":
+            assert shared_state.get(shared.PROXY_STATUS) is None, args
+
+
+def test_follow_ignores_cursor_older_than_interval(run, shared_state, monkeypatch):
+    followed = {}
+
+    def follow_requests(**kwargs):
+        followed.update(kwargs)
+        return iter([])
+
+    run.client.follow_requests = follow_requests
+    run("requests", "--follow", "--interval", "1")
+    shared_state.set(shared.REQUESTS_CURSOR, {"id": "r1", "capture_version": "~r1:None:None"})
+
+    assert followed["latest_id"]() == "r1"
+    monkeypatch.setattr(shared.time, "time", lambda: time.time_ns() / 1e9 + 5)
+    assert followed["latest_id"]() is None
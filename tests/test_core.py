@@ -0,0 +1,102 @@
+"""
+Tests for flipper_rpi.core
+"""
+
+import threading
+from itertools import islice
+
+from flipper_rpi.core import FlipperHTTPClient, ProxyPool, SeenIds
+
+
+def test_proxy_pool_status_aggregates_ports(fake_client):
+    fake_client.port_status = {
+        8888: {"status": "running", "requests": 3, "bytes_in": 10, "bytes_out": 20},
+        8889: {"status": "stopped", "requests": "n/a"},
+    }
+    status = ProxyPool(fake_client, [8888, 8889, 8888]).status()
+
+    assert set(status["ports"]) == {"8888", "8889"}
+    assert status["healthy"] is False
+    assert status["aggregate"] == {
+        "requests": 3, "bytes_in": 10, "bytes_out": 20, "running": 1, "total": 2,
+    }
+
+
+def test_proxy_pool_start_reports_each_port(fake_client):
+    fake_client.failing_ports = {8889}
+    results = ProxyPool(fake_client, [8888, 8889]).start()
+
+    assert results[8888]["status"] == "success"
+    assert results[8889]["status"] == "error"
+
+
+def test_client_session_is_per_thread(config):
+    client = FlipperHTTPClient(config)
+    sessions = []
+    thread = threading.Thread(target=lambda: sessions.append(client.session))
+    thread.start()
+    thread.join()
+
+    assert client.session is client.session
+    assert sessions[0] is not client.session
+
+
+def test_seen_ids_evicts_oldest():
+    seen = SeenIds(maxlen=2)
+
+    assert seen.add("a") and seen.add("b")
+    assert not seen.add("a")
+    assert seen.add("c")
+    assert "a" not in seen and len(seen) == 2
+
+
+class PagedClient(FlipperHTTPClient):
+    """Client whose /api/requests replies come from a list of pages (ignores since)"""
+
+    def __init__(self, config, pages):
+        super().__init__(config)
+        self.pages = list(pages)
+        self.limits = []
+
+    def get_intercepted_requests(self, limit=50, since=None):
+        self.limits.append(limit)
+        page = self.pages.pop(0) if len(self.pages) > 1 else self.pages[0]
+        return {"status": "success", "requests": page[-limit:]}
+
+
+def _ids(n, start=0):
+    return [{"id": f"r{i}"} for i in range(start, start + n)]
+
+
+def test_follow_requests_backlog_then_new_only(config, monkeypatch):
+    monkeypatch.setattr("flipper_rpi.core.time.sleep", lambda s: None)
+    client = PagedClient(config, [_ids(5), _ids(7)])
+    received = [req["id"] for req in islice(client.follow_requests(limit=100, backlog=2), 4)]
+
+    assert received == ["r3", "r4", "r5", "r6"]
+
+
+def test_follow_requests_page_covers_backlog(config, monkeypatch):
+    monkeypatch.setattr("flipper_rpi.core.time.sleep", lambda s: None)
+    client = PagedClient(config, [_ids(600)])
+    received = list(islice(client.follow_requests(limit=100, backlog=500), 500))
+
+    assert len(received) == 500 and client.limits[0] == 500
+
+
+def test_follow_requests_warns_on_gap(config, monkeypatch, caplog):
+    monkeypatch.setattr("flipper_rpi.core.time.sleep", lambda s: None)
+    client = PagedClient(config, [_ids(3), _ids(3, start=10), _ids(3, start=20)])
+    list(islice(client.follow_requests(limit=3, backlog=3), 7))
+
+    assert "may have been missed" in caplog.text
+
+
+def test_follow_requests_skips_polls_while_shared_cursor_unchanged(config, monkeypatch):
+    monkeypatch.setattr("flipper_rpi.core.time.sleep", lambda s: None)
+    client = PagedClient(config, [_ids(2), _ids(3)])
+    latest = iter(["r1", "r1", "r2"])
+    received = list(islice(client.follow_requests(backlog=2, latest_id=lambda: next(latest)), 3))
+
+    assert [req["id"] for req in received] == ["r0", "r1", "r2"]
+    assert len(client.limits) == 2
@@ -0,0 +1,63 @@
+"""
+Tests for flipper_rpi.output and print_table
+"""
+
+import io
+
+from flipper_rpi import output
+from flipper_rpi.utils import print_table
+
+LONG_URL = "http://example.com/" + "x" * 200
+
+
+def render(rows, headers=None, fmt="table", **kwargs):
+    stream = io.StringIO()
+    output.write_rows(rows, headers, fmt=fmt, stream=stream, **kwargs)
+    return stream.getvalue()
+
+
+def test_table_never_truncates_by_default():
+    text = render([{"id": 1, "url": "short"}, {"id": 2, "url": LONG_URL}], sample_rows=1)
+
+    assert LONG_URL in text
+
+
+def test_table_truncates_when_asked():
+    text = render([{"id": 1, "url": LONG_URL}], max_width=20)
+
+    assert LONG_URL not in text
+    assert "http://example.com/…" in text
+
+
+def test_table_chunks_do_not_change_output():
+    rows = [{"a": i, "b": "x" * i} for i in range(30)]
+
+    assert render(rows, chunk_rows=1) == render(rows, chunk_rows=1000)
+
+
+def test_jsonl_passes_whole_rows_through():
+    text = render([{"id": "r1", "size": None, "headers": {"Host": "a"}}], fmt="jsonl")
+
+    assert text == '{"id":"r1","size":null,"headers":{"Host":"a"}}\n'
+
+
+def test_json_is_a_valid_array():
+    import json
+
+    assert json.loads(render([{"a": 1}, {"a": 2}], fmt="json")) == [{"a": 1}, {"a": 2}]
+
+
+def test_csv_quotes_and_blanks_missing():
+    text = render([{"id": 1, "url": "a,b", "size": None}], ["id", "url", "size"], fmt="csv")
+
+    assert text == 'id,url,size\n1,"a,b",\n'
+
+
+def test_print_table_matches_baseline_layout(capsys):
+    print_table([{"a": 1, "b": None}, {"a": 22, "b": LONG_URL}])
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "a  | " + "b".ljust(len(LONG_URL))
+    assert lines[1] == "-" * len(lines[0])
+    assert lines[2] == "1  | " + "None".ljust(len(LONG_URL))
+    assert lines[3] == f"22 | {LONG_URL}"
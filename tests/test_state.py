@@ -0,0 +1,113 @@
+"""
+Tests for flipper_rpi.state and the web app's use of it
+"""
+
+import time
+
+import pytest
+
+from flipper_rpi import state as shared
+from flipper_rpi.state import SharedState, StateSync
+
+from conftest import FakeClient
+
+
+@pytest.fixture
+def state(tmp_path):
+    return SharedState(str(tmp_path / "state.db"))
+
+
+def test_set_get_and_max_age(state, monkeypatch):
+    state.set("k", {"a": 1})
+    assert state.get("k") == {"a": 1}
+
+    monkeypatch.setattr(shared.time, "time", lambda: time.time_ns() / 1e9 + 100)
+    assert state.get("k", max_age=10) is None
+    assert state.get("k") == {"a": 1}
+
+
+def test_delete(state):
+    state.set("a", 1)
+    state.set("b", 2)
+    state.delete("a", "b")
+
+    assert state.get("a") is None and state.get("b") is None
+
+
+def test_leader_lease_is_exclusive_until_expiry(state):
+    assert state.acquire_leader("one", ttl=60)
+    assert state.acquire_leader("one", ttl=60)
+    assert not state.acquire_leader("two", ttl=60)
+
+    state.release_leader("one")
+    assert state.acquire_leader("two", ttl=-1)
+    assert state.acquire_leader("one", ttl=60)
+
+
+def test_sample_publishes_cursor(state, config, monkeypatch):
+    monkeypatch.setattr(shared, "get_system_stats", lambda: {"cpu_percent": 1.0})
+    client = FakeClient(requests_list=[{"id": 7}])
+    StateSync(state, client, config).sample()
+
+    assert state.get(shared.REQUESTS_CURSOR) == {"id": "7", "capture_version": "~7:None:None"}
+    assert state.get(shared.PROXY_POOL_STATUS)["aggregate"]["total"] == 1
+
+
+def test_sample_stops_when_lease_is_lost(state, config, monkeypatch):
+    monkeypatch.setattr(shared, "get_system_stats", lambda: {"cpu_percent": 1.0})
+    sync = StateSync(state, FakeClient(), config)
+    state.acquire_leader("other", ttl=60)
+    sync.sample()
+
+    assert state.get(shared.SYSTEM_STATS) is None
+    assert sync.lease_ttl > config.timeout
+
+
+def test_sync_thread_starts_lazily(state, config, monkeypatch):
+    monkeypatch.setattr(shared, "get_system_stats", lambda: {"cpu_percent": 1.0})
+    sync = StateSync(state, FakeClient(), config, interval=60)
+    assert sync._thread is None
+
+    sync.touch()
+    assert sync._thread.is_alive()
+    sync.stop()
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app(requests_list=[{"id": "r1", "timestamp": 1}], shared_state=True)
+
+
+def test_pool_start_invalidates_cached_status(app):
+    state = app.config['flipper_state']
+    state.set(shared.PROXY_POOL_STATUS, {"status": "success", "stale": True})
+    api = app.test_client()
+
+    assert api.get("/api/proxy/pool/status").json.get("stale") is True
+    api.post("/api/proxy/pool/start", json={"ports": [8888, 8889]})
+    status = api.get("/api/proxy/pool/status").json
+
+    assert "stale" not in status
+    assert set(status["ports"]) == {"8888", "8889"}
+
+
+def test_unreadable_state_falls_back_to_upstream(app, monkeypatch):
+    def broken(*args, **kwargs):
+        raise shared.sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(SharedState, "get", broken)
+    response = app.test_client().get("/api/proxy/status")
+
+    assert response.status_code == 200
+    assert ("get_proxy_status", None) in app.fake_client.calls
+
+
+def test_analytics_uses_shared_cursor_instead_of_probe(app):
+    pytest.importorskip("numpy")
+    app.config['flipper_state'].set(shared.REQUESTS_CURSOR, {"id": "r1", "capture_version": "r1"})
+    api = app.test_client()
+    api.get("/api/analytics")
+    api.get("/api/analytics")
+
+    fetches = [call for call in app.fake_client.calls if call[0] == "get_intercepted_requests"]
+    assert fetches == [("get_intercepted_requests", 100000)]
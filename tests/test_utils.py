@@ -0,0 +1,21 @@
+"""
+Tests for flipper_rpi.utils
+"""
+
+import pytest
+
+from flipper_rpi.utils import parse_ports
+
+
+def test_parse_ports():
+    assert parse_ports("8888, 8889,,9999") == [8888, 8889, 9999]
+
+
+def test_parse_ports_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_ports("8888,abc")
+
+
+def test_parse_ports_rejects_empty():
+    with pytest.raises(ValueError):
+        parse_ports(" , ")
@@ -0,0 +1,64 @@
+"""
+Tests for flipper_rpi.wire and /api/requests content negotiation
+"""
+
+import pytest
+
+from flipper_rpi import wire
+
+
+def test_dumps_json_compact_and_indented():
+    assert wire.dumps_json({"a": [1, 2]}) == b'{"a":[1,2]}'
+    assert wire.dumps_json({"a": 1}, indent=2) == b'{\n  "a": 1\n}'
+
+
+def test_decode_ignores_content_type_parameters():
+    assert wire.decode(b'{"x":1}', "application/json; charset=utf-8") == {"x": 1}
+    assert wire.decode(b'{"x":1}', None) == {"x": 1}
+
+
+def test_msgpack_round_trip():
+    pytest.importorskip("msgpack")
+    data = {"requests": [{"id": "r1", "size": 10}]}
+    payload = wire.encode(data, wire.MSGPACK_MIMETYPE)
+
+    assert wire.decode(payload, wire.MSGPACK_MIMETYPE) == data
+
+
+@pytest.fixture
+def api(make_app):
+    """Flask test client backed by a FakeClient"""
+    return make_app(requests_list=[{"id": "r1", "url": "http://a.com/"}]).test_client()
+
+
+def test_requests_default_to_json(api):
+    response = api.get("/api/requests", headers={"Accept": "*/*"})
+
+    assert response.mimetype == wire.JSON_MIMETYPE
+    assert response.json["requests"][0]["id"] == "r1"
+
+
+def test_requests_negotiate_msgpack(api):
+    pytest.importorskip("msgpack")
+    response = api.get("/api/requests", headers={"Accept": wire.MSGPACK_MIMETYPE})
+
+    assert response.mimetype == wire.MSGPACK_MIMETYPE
+    assert "Accept" in response.vary
+    assert wire.decode(response.data, response.mimetype)["requests"][0]["id"] == "r1"
+
+
+def test_dumps_json_handles_big_integers():
+    assert wire.dumps_json({"n": 2 ** 70}) == b'{"n":1180591620717411303424}'
+
+
+def test_format_json_handles_big_integers():
+    from flipper_rpi.utils import format_json
+
+    assert format_json({"n": 2 ** 70}) == '{\n  "n": 1180591620717411303424\n}'
+
+
+def test_accept_header_prefers_faster_codec():
+    if wire.orjson is not None or wire.msgpack is None:
+        assert wire.ACCEPT_HEADER.startswith(wire.JSON_MIMETYPE)
+    else:
+        assert wire.ACCEPT_HEADER.startswith(wire.MSGPACK_MIMETYPE)